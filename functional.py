@@ -1,10 +1,11 @@
 import random
+import numpy as np
 
 
 # parent class for all species
 class Species:
     def __init__(self, strength, speed, toughness, coordination, health, reproduction_rate, survivability,
-                 harvest_rate=0):
+                 harvest_rate=0, lifespan=None):
         self.strength = strength
         self.speed = speed
         self.toughness = toughness
@@ -13,7 +14,8 @@ class Species:
         self.reproduction_rate = reproduction_rate
         self.survivability = survivability  # chance to survive random death each round
         self.harvest_rate = harvest_rate
-        self.tamed_rounds = 0  # number of rounds of dino tamed
+        # tame timers are per animal, see AnimalLayers.tamed (or tamed_dinos without layers)
+        self.lifespan = lifespan  # max age in rounds, None = no limit (only used with AnimalLayers)
 
     def attack(self, target_health, target_toughness, coord_bonus=1.0):
         # damage dealt and gives kill chance
@@ -21,21 +23,29 @@ class Species:
         kill_chance = damage / target_health
         return kill_chance
 
-    def move(self):
+    def move(self, roll=None):
         # True if species moves this turn
-        return random.random() < self.speed
+        if roll is None:
+            roll = random.random()
+        return roll < self.speed
 
-    def reproduce(self):
+    def reproduce(self, roll=None):
         # if species reproduces
-        return random.random() < self.reproduction_rate
+        if roll is None:
+            roll = random.random()
+        return roll < self.reproduction_rate
 
-    def survives_round(self):
+    def survives_round(self, roll=None):
         #True if species survives random death
-        return random.random() < self.survivability
+        if roll is None:
+            roll = random.random()
+        return roll < self.survivability
 
-    def harvest(self):
+    def harvest(self, roll=None):
         # True if herbivore successfully harvests
-        return random.random() < self.harvest_rate
+        if roll is None:
+            roll = random.random()
+        return roll < self.harvest_rate
     
     def __eq__(self, other): return other == self.__class__.__name__ # makes code more readable
 
@@ -50,7 +60,8 @@ class Velociraptor(Species):
             coordination=0.85,  # very high
             health=55,  # medium
             reproduction_rate=0.6,  # medium
-            survivability=0.975
+            survivability=0.975,
+            lifespan=120  # 10 years
         )
 
 
@@ -64,7 +75,8 @@ class TRex(Species):
             coordination=0.25,  # very low
             health=90,  # high
             reproduction_rate=0.33,  # low
-            survivability=0.975
+            survivability=0.975,
+            lifespan=240  # 20 years
         )
 
 
@@ -79,7 +91,8 @@ class Triceratops(Species):
             health=60,  # medium
             reproduction_rate=0.35,  # high
             harvest_rate=0.4,  # medium/high
-            survivability=0.71
+            survivability=0.71,
+            lifespan=180  # 15 years
         )
 
 
@@ -94,7 +107,8 @@ class Brachiosaurus(Species):
             health=100,  # very high
             reproduction_rate=0.25,  # very low
             harvest_rate=0.5,  # medium
-            survivability=0.78
+            survivability=0.78,
+            lifespan=300  # 25 years
         )
 
 
@@ -109,13 +123,16 @@ class Human(Species):
             health=30,  # very low
             reproduction_rate=0.3,  # medium
             harvest_rate=0.15,  # low/medium
-            survivability=0.825
+            survivability=0.825,
+            lifespan=240  # 20 years
         )
 
-    def tame(self, target_species):
+    def tame(self, target_species, roll=None):
         # humans tame raptors and t-rexes to make them docile for 5 rounds
         if target_species in [1, 2]:  # raptor/Trex
-            if random.random() < 0.3:  # 30% chance to tame
+            if roll is None:
+                roll = random.random()
+            if roll < TAME_CHANCE:  # 30% chance to tame
                 return True
         return False
 
@@ -126,8 +143,251 @@ species_stats = {
     4: Brachiosaurus(),
     5: Human()
 }
+
+# who each species hunts (grass and its own species are never prey)
+prey_rules = {
+    0: [],
+    1: [2, 3, 4, 5],  # velociraptor
+    2: [1, 3, 4, 5],  # t-rex
+    3: [],  # triceratops
+    4: [],  # brachiosaurus
+    5: [1, 2, 3, 4]  # human
+}
+
+# reproduction chance after a kill = reproduction_rate * multiplier for what was killed
+# species not listed here dont reproduce from kills
+kill_repro_multipliers = {
+    1: {4: 1.5, 2: 1.3, 3: 1.1, 1: 0.9, 5: 0.7},
+    2: {4: 1.5, 2: 1.3, 3: 1.1, 1: 0.9, 5: 0.7}
+}
+
+
+def build_interaction_tables(species_stats, prey_rules, kill_repro_multipliers):
+    # everything about a hunt only depends on (attacker, target, same species neighbours 0-8)
+    # so work it out once here and just look it up during the round
+    # kill_table[attacker, target, neighbours] = kill chance against a target at full health
+    # repro_table[attacker, target] = chance of an offspring on the kill spot
+    kill_table = np.zeros((6, 6, 9))
+    repro_table = np.zeros((6, 6))
+    for attacker, targets in prey_rules.items():
+        if not targets:
+            continue
+        species = species_stats[attacker]
+        for target in targets:
+            target_stats = species_stats[target]
+            for same_species_count in range(9):
+                coord_bonus = 1 + (species.coordination * same_species_count * 0.1)
+                kill_table[attacker, target, same_species_count] = species.attack(
+                    target_stats.health, target_stats.toughness, coord_bonus)
+            multiplier = kill_repro_multipliers.get(attacker, {}).get(target, 0)
+            repro_table[attacker, target] = species.reproduction_rate * multiplier
+    return kill_table, repro_table
+
+
+def interaction_tables():
+    # tables for the species table as it is right now, so edits to species_stats,
+    # prey_rules or kill_repro_multipliers take effect on the next round
+    return build_interaction_tables(species_stats, prey_rules, kill_repro_multipliers)
+
+
 # tame length (key = (row, col), value = # of rounds left)
 tamed_dinos = {}
+TAME_ROUNDS = 5
+TAME_CHANCE = 0.3
+# health lost per point of damage when an attack doesnt kill (only used with AnimalLayers)
+WOUND_FACTOR = 10
+
+# phases of a round, each one gets its own random numbers
+PHASE_SURVIVAL = 0
+PHASE_HARVEST = 1
+PHASE_HUNT = 2
+PHASE_MOVE = 3
+# random numbers each cell can use in a phase (see the slot comments in update_states/update_positions)
+PHASE_SLOTS = {PHASE_SURVIVAL: 1, PHASE_HARVEST: 24, PHASE_HUNT: 11, PHASE_MOVE: 3}
+
+
+class CellRNG:
+    # counter-based random numbers keyed by (seed, step, phase, slot, cell)
+    # a cell always gets the same draws no matter what order the cells are processed in
+    # or how the grid is split up, so fast/parallel versions can be checked against this one
+    # draws are float32 and only a band of rows per phase is kept, so memory stays small on big grids
+    band_rows = 64
+
+    def __init__(self, seed, shape, step=0):
+        self.seed = seed
+        self.shape = shape
+        self.step = step
+        self.bands = {}  # phase -> (first row, draws for those rows)
+
+    def set_step(self, step):
+        # new round = new counters, throw away the old draws
+        self.step = step
+        self.bands = {}
+
+    def block(self, phase, row_start, row_end):
+        # draws for rows row_start..row_end-1 of one phase, shape (rows, cols, slots)
+        # step and phase sit in the high counter words and the slots of a cell are next to each other
+        # in the stream, Philox makes 8 float32s per counter so we can jump straight to any row
+        cols = self.shape[1]
+        slots = PHASE_SLOTS[phase]
+        start = row_start * cols * slots
+        bit_gen = np.random.Philox(key=self.seed, counter=[0, 0, phase, self.step])
+        bit_gen.advance(start // 8)
+        gen = np.random.Generator(bit_gen)
+        gen.random(start % 8, dtype=np.float32)  # skip the leftover numbers from the jump
+        return gen.random((row_end - row_start, cols, slots), dtype=np.float32)
+
+    def field(self, phase):
+        # draws for the whole grid of one phase, for phases that dont go through the grid in row order
+        _, draws = self.bands.get(phase, (0, None))
+        if draws is None or len(draws) < self.shape[0]:
+            draws = self.block(phase, 0, self.shape[0])
+            self.bands[phase] = (0, draws)
+        return draws
+
+    def uniform(self, phase, slot, row, col):
+        row_start, draws = self.bands.get(phase, (0, None))
+        if draws is None or not row_start <= row < row_start + len(draws):
+            # next band, replaces the old one
+            row_end = min(row + self.band_rows, self.shape[0])
+            draws = self.block(phase, row, row_end)
+            row_start = row
+            self.bands[phase] = (row_start, draws)
+        return draws[row - row_start, col, slot]
+
+
+class AnimalLayers:
+    # per-animal attributes kept as typed arrays the size of the domain, value at (row, col)
+    # belongs to whatever animal stands there, so there are no python objects per animal
+    # births set them, deaths reset them and movement carries them along with the animal
+    def __init__(self, domain):
+        self.health = np.zeros(domain.shape, dtype=np.float32)
+        self.age = np.zeros(domain.shape, dtype=np.uint16)
+        self.tamed = np.zeros(domain.shape, dtype=np.uint8)  # rounds left tamed
+
+        # per species lookups, index 0 is grass
+        self.max_health = np.zeros(6, dtype=np.float32)
+        self.lifespan = np.full(6, np.iinfo(np.uint16).max, dtype=np.uint16)
+        for number, species in species_stats.items():
+            self.max_health[number] = species.health
+            if species.lifespan is not None:
+                self.lifespan[number] = species.lifespan
+
+        # everyone starts at full health
+        self.health[:] = self.max_health[domain]
+
+    def layers(self):
+        return self.health, self.age, self.tamed
+
+    def born(self, row, col, species_type):
+        self.health[row, col] = self.max_health[species_type]
+        self.age[row, col] = 0
+        self.tamed[row, col] = 0
+
+    def died(self, row, col):
+        for layer in self.layers():
+            layer[row, col] = 0
+
+    def moved(self, row, col, new_row, new_col):
+        for layer in self.layers():
+            layer[new_row, new_col] = layer[row, col]
+            layer[row, col] = 0
+
+    def tick(self, domain):
+        # start of a round: everyone gets older, tame timers count down
+        # returns the animals that are now too old
+        alive = domain != 0
+        self.age[alive] += 1
+        np.subtract(self.tamed, 1, out=self.tamed, where=self.tamed > 0)
+        return alive & (self.age >= self.lifespan[domain])
+
+    def clear(self, mask):
+        for layer in self.layers():
+            layer[mask] = 0
+
+
+# the 8 neighbour directions in the same order as get_neighbors, opposite of direction k is 7 - k
+NEIGHBOR_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+# directions that are set in each free-neighbour bitmask, so picking one is a table lookup
+FREE_DIRECTIONS = [tuple(k for k in range(8) if mask >> k & 1) for mask in range(256)]
+
+
+class FreeIndex:
+    # which neighbours of every cell are grass, kept up to date as cells change
+    # free[cell] has bit k set when the neighbour in direction k is grass, the number of grass
+    # neighbours is the length of FREE_DIRECTIONS[mask] so it doesnt need an array of its own
+    # all writes to the domain go through set() so only the 8 cells around a change are touched
+    def __init__(self, domain):
+        self.domain = domain
+        rows, cols = domain.shape
+        # stored with a 1 cell border so the neighbours of any cell are at fixed offsets,
+        # a bytearray for fast single cell access with a numpy view over the same memory for the build
+        self.width = cols + 2
+        self.free = bytearray((rows + 2) * self.width)
+
+        free = self.masks()
+        grass = np.zeros((rows + 2, cols + 2), dtype=np.uint8)  # border is never grass
+        grass[1:-1, 1:-1] = domain == 0
+        for k, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+            free |= grass[1 + dr:rows + 1 + dr, 1 + dc:cols + 1 + dc] << k
+
+    def set(self, row, col, value):
+        # write a cell of the domain and fix up its neighbours' masks if it turned grass or stopped being grass
+        was_grass = self.domain.item(row, col) == 0
+        self.domain[row, col] = value
+        if was_grass != (value == 0):
+            # unrolled since this runs for every birth, death and move
+            cell = (row + 1) * self.width + col + 1
+            free = self.free
+            up, down = cell - self.width, cell + self.width
+            free[up - 1] ^= 128
+            free[up] ^= 64
+            free[up + 1] ^= 32
+            free[cell - 1] ^= 16
+            free[cell + 1] ^= 8
+            free[down - 1] ^= 4
+            free[down] ^= 2
+            free[down + 1] ^= 1
+
+    def masks(self):
+        # numpy view of the bitmasks without the border
+        rows, cols = self.domain.shape
+        return np.frombuffer(self.free, dtype=np.uint8).reshape(rows + 2, self.width)[1:-1, 1:-1]
+
+    def directions(self, row, col):
+        # directions of the grass neighbours, in get_neighbors order
+        return FREE_DIRECTIONS[self.free[(row + 1) * self.width + col + 1]]
+
+    def count(self, row, col):
+        return len(self.directions(row, col))
+
+    def choose(self, row, col, rng, phase, slot):
+        # random grass neighbour drawn like pick() (random.choice without a cell rng), None if there isnt one
+        directions = self.directions(row, col)
+        if not directions:
+            return None
+        dr, dc = NEIGHBOR_OFFSETS[pick(rng, phase, slot, row, col, directions)]
+        return row + dr, col + dc
+
+
+def is_tamed(layers, row, col):
+    if layers is None:
+        return (row, col) in tamed_dinos
+    return layers.tamed[row, col] > 0
+
+
+def roll(rng, phase, slot, row, col):
+    # random number for one cell, uses the shared random stream if there is no cell rng
+    if rng is None:
+        return random.random()
+    return rng.uniform(phase, slot, row, col)
+
+
+def pick(rng, phase, slot, row, col, options):
+    # random.choice but keyed to the cell
+    if rng is None:
+        return random.choice(options)
+    return options[int(rng.uniform(phase, slot, row, col) * len(options))]
 
 
 def get_neighbors(domain, row, col):
@@ -155,10 +415,14 @@ def count_same_species_neighbors(domain, row, col, species_type):
     return count
 
 
-def update_states(domain):
+def update_states(domain, rng=None, layers=None, tables=None):
     # for interactions between species per round
+    # rng is an optional CellRNG, without it everything uses the shared random stream
+    # layers is optional AnimalLayers, with it animals get wounded, age and stay tamed where they walk
+    # tables is (kill_table, repro_table) from interaction_tables(), built here if not given
     rows, cols = domain.shape
     new_domain = domain.copy()
+    kill_table, repro_table = tables if tables is not None else interaction_tables()
 
     # update tamed status
     global tamed_dinos
@@ -170,17 +434,28 @@ def update_states(domain):
     for pos in tame_remove:
         del tamed_dinos[pos]
 
+    # everyone ages, the ones past their lifespan die
+    if layers is not None:
+        too_old = layers.tick(domain)
+        new_domain[too_old] = 0
+        layers.clear(too_old)
+
     # iterates through each cell and kills randomly based on survivability stat
     for i in range(rows):
         for j in range(cols):
-            current = domain[i, j]
+            current = new_domain[i, j]
             if current != 0 and current in species_stats:
                 species = species_stats[current]
                 # check using survives_round()
-                if not species.survives_round():
+                if not species.survives_round(roll(rng, PHASE_SURVIVAL, 0, i, j)):
                     new_domain[i, j] = 0  # dies and then becomes grass
+                    if layers is not None:
+                        layers.died(i, j)
                     continue
 
+    # grass neighbours of every cell, all changes to new_domain from here on go through free.set
+    free = FreeIndex(new_domain)
+
     # iterates thru each cell
     for i in range(rows):
         for j in range(cols):
@@ -192,97 +467,94 @@ def update_states(domain):
             # species stats
             if current in species_stats:
                 species = species_stats[current]
-                neighbors = get_neighbors(new_domain, i, j)
 
                 if current in [3, 4, 5]:  # triceratops, brachiosaurus, human
                     # check for adjacent grass to harvest
-                    for nr, nc in neighbors:
-                        if new_domain[nr, nc] == 0:  # grass tile
-                            if species.harvest():
-                                # try to reproduce
-                                if species.reproduce():
-                                    # find empty grass tile to place offspring
-                                    empty_neighbors = [(r, c) for r, c in neighbors if new_domain[r, c] == 0]
-                                    if empty_neighbors:
-                                        spawn_r, spawn_c = random.choice(empty_neighbors)
-                                        new_domain[spawn_r, spawn_c] = current
-                                break
+                    # slots: harvest k, reproduce 8 + k, spawn spot 16 + k for grass in direction k
+                    for k in free.directions(i, j):
+                        if species.harvest(roll(rng, PHASE_HARVEST, k, i, j)):
+                            # try to reproduce
+                            if species.reproduce(roll(rng, PHASE_HARVEST, 8 + k, i, j)):
+                                # place offspring on an empty grass tile
+                                spawn_r, spawn_c = free.choose(i, j, rng, PHASE_HARVEST, 16 + k)
+                                free.set(spawn_r, spawn_c, current)
+                                if layers is not None:
+                                    layers.born(spawn_r, spawn_c, current)
+                            break
 
                 # Carnivores hunt
-                if current in [1, 2, 5]:  # velociraptor, t-rex, human
+                prey = prey_rules[current]
+                if prey:  # velociraptor, t-rex, human
                     # look for prey
+                    # slots: tame k for neighbor k, then 8 prey choice, 9 kill, 10 reproduce
+                    neighbors = get_neighbors(new_domain, i, j)
                     prey_neighbors = []
-                    for nr, nc in neighbors:
+                    for k, (nr, nc) in enumerate(neighbors):
                         neighbor_species = new_domain[nr, nc]
 
                         # humans try to tame first
                         if current == 5 and neighbor_species in [1, 2]:
-                            if (nr, nc) not in tamed_dinos:
+                            if not is_tamed(layers, nr, nc):
                                 human = species_stats[5]
-                                if human.tame(neighbor_species):
-                                    tamed_dinos[(nr, nc)] = 5  # tamed for 3 rounds
+                                if human.tame(neighbor_species, roll(rng, PHASE_HUNT, k, i, j)):
+                                    if layers is None:
+                                        tamed_dinos[(nr, nc)] = TAME_ROUNDS
+                                    else:
+                                        layers.tamed[nr, nc] = TAME_ROUNDS
                                     continue
 
                         # check if it's valid prey
-                        if neighbor_species == 0:  # grass, skip
-                            continue
-                        if current == neighbor_species:  # same species, skip
+                        if neighbor_species not in prey:
                             continue
-                        if (nr, nc) in tamed_dinos:  # tamed dino, humans can't attack
+                        if is_tamed(layers, nr, nc):  # tamed dino, humans can't attack
                             if current == 5:
                                 continue
 
-                        # herbivores don't attack humans or other herbivores
-                        if current in [3, 4]:
-                            if neighbor_species in [1, 2]:  # only attack carnivores
-                                prey_neighbors.append((nr, nc, neighbor_species))
-                        else:
-                            prey_neighbors.append((nr, nc, neighbor_species))
+                        prey_neighbors.append((nr, nc, neighbor_species))
 
                     # attack a random prey
                     if prey_neighbors:
-                        target_r, target_c, target_species = random.choice(prey_neighbors)
+                        target_r, target_c, target_species = pick(rng, PHASE_HUNT, 8, i, j, prey_neighbors)
 
-                        # calculate coordination bonus
+                        # coordination bonus depends on how many of the pack are around
                         same_species_count = count_same_species_neighbors(new_domain, i, j, current)
-                        coord_bonus = 1 + (species.coordination * same_species_count * 0.1)
+                        kill_chance = kill_table[current, target_species, same_species_count]
 
-                        # use attack method to calculate kill chance
-                        target_stats = species_stats[target_species]
-                        kill_chance = species.attack(target_stats.health, target_stats.toughness, coord_bonus)
+                        # with layers wounded targets are easier to kill
+                        if layers is not None:
+                            damage = kill_chance * species_stats[target_species].health  # attack() gives damage / health
+                            kill_chance = damage / layers.health[target_r, target_c]
+
+                        # survivors keep their wounds
+                        killed = roll(rng, PHASE_HUNT, 9, i, j) < kill_chance
+                        if not killed and layers is not None:
+                            layers.health[target_r, target_c] -= damage * WOUND_FACTOR
+                            killed = layers.health[target_r, target_c] <= 0
 
                         # check if target dies
-                        if random.random() < kill_chance:
+                        if killed:
                             # target dies
-                            new_domain[target_r, target_c] = 0  # becomes grass
+                            free.set(target_r, target_c, 0)  # becomes grass
+                            if layers is not None:
+                                layers.died(target_r, target_c)
 
                             # carnivore tries to reproduce
-                            if current in [1, 2]:
-                                # reproduction chance varies by what was killed
-                                base_repro = species.reproduction_rate
-                                if target_species == 4:  # brachiosaurus
-                                    repro_chance = base_repro * 1.5
-                                elif target_species == 2:  # trex
-                                    repro_chance = base_repro * 1.3
-                                elif target_species == 3:  # triceratops
-                                    repro_chance = base_repro * 1.1
-                                elif target_species == 1:  # velociraptor
-                                    repro_chance = base_repro * 0.9
-                                elif target_species == 5:  # human
-                                    repro_chance = base_repro * 0.7
-                                else:
-                                    repro_chance = base_repro
-
-                                if random.random() < repro_chance:
-                                    new_domain[target_r, target_c] = current
+                            # reproduction chance varies by what was killed
+                            repro_chance = repro_table[current, target_species]
+                            if repro_chance > 0:
+                                if roll(rng, PHASE_HUNT, 10, i, j) < repro_chance:
+                                    free.set(target_r, target_c, current)
+                                    if layers is not None:
+                                        layers.born(target_r, target_c, current)
 
     return new_domain
 
 
-def update_positions(domain):
-    # movement of species
+def update_positions(domain, rng=None, layers=None):
+    # movement of species, layers (AnimalLayers) move along with the animals
     rows, cols = domain.shape
     new_domain = domain.copy()
+    free = FreeIndex(new_domain)
 
     # create a list of all non-grass positions
     positions = []
@@ -292,7 +564,13 @@ def update_positions(domain):
                 positions.append((i, j))
 
     # shuffle to randomize movement order so it doesnt just give precedence to top right species
-    random.shuffle(positions)
+    # with a cell rng the order comes from a per-cell key so it doesnt depend on the scan order
+    if rng is None:
+        random.shuffle(positions)
+    else:
+        # ties (float32 keys on big grids) are broken by position, which is still order independent
+        order_keys = rng.field(PHASE_MOVE)[:, :, 0]
+        positions.sort(key=lambda pos: (order_keys[pos], pos))
 
     for i, j in positions:
         current = domain[i, j]
@@ -302,15 +580,31 @@ def update_positions(domain):
         # check if this species moves
         if current in species_stats:
             species = species_stats[current]
-            if species.move():
-                # find adjacent empty grass tiles
-                neighbors = get_neighbors(domain, i, j)
-                empty_neighbors = [(r, c) for r, c in neighbors if new_domain[r, c] == 0]
-
-                if empty_neighbors:
-                    # move to random empty neighbor aka grass tile
-                    new_r, new_c = random.choice(empty_neighbors)
-                    new_domain[new_r, new_c] = current
-                    new_domain[i, j] = 0
+            if species.move(roll(rng, PHASE_MOVE, 1, i, j)):
+                # move to random adjacent empty grass tile
+                if free.count(i, j):
+                    new_r, new_c = free.choose(i, j, rng, PHASE_MOVE, 2)
+                    free.set(new_r, new_c, current)
+                    free.set(i, j, 0)
+                    if layers is not None:
+                        layers.moved(i, j, new_r, new_c)
 
     return new_domain
+
+
+def simulate(domain, steps, seed, use_layers=False):
+    # runs the automaton from a starting domain with a per-cell rng, same seed = same run
+    # returns the number of cells of each species after every round, shape (steps + 1, 6),
+    # and the final domain
+    tamed_dinos.clear()
+    rng = CellRNG(seed, domain.shape)
+    layers = AnimalLayers(domain) if use_layers else None
+    tables = interaction_tables()  # from the species table as it is when the run starts
+    counts = [np.bincount(domain.ravel(), minlength=6)[:6]]
+    for currTime in range(1, steps + 1):
+        rng.set_step(currTime)
+        domain = update_states(domain, rng, layers, tables)
+        domain = update_positions(domain, rng, layers)
+        counts.append(np.bincount(domain.ravel(), minlength=6)[:6])
+    tamed_dinos.clear()
+    return np.array(counts), domain
@@ -4,12 +4,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import colors
 import functional as el  # Custom module containing the update functions for the simulation
+import spatial_stats as ss  # FFT pair correlations, clusters and nearest neighbours
+import render  # downsampled frames for big grids
 
 
 # Function to plot the spatial distribution of the environment
 def plotSpatial(data, fileNumber):
     # grass, velociraptor, t-rex, triceratops, brachiosaurus, human
-    cmap = colors.ListedColormap(['lawngreen', 'orange', 'red', 'purple', 'darkgreen', 'yellow'])
+    cmap = colors.ListedColormap(render.SPECIES_COLORS)
     plt.figure(figsize=(7, 6))
     plt.pcolor(data, cmap=cmap, edgecolors='k', linewidths=1, vmin=0, vmax=5)
     cbar = plt.colorbar(label="", orientation="vertical", ticks=[0.4, 1.2, 2, 2.8, 3.6, 4.4])
@@ -18,6 +20,21 @@ def plotSpatial(data, fileNumber):
     plt.close()
 
 
+# Function to plot big grids, one pixel per block of cells instead of one box per cell
+def plotSpatialLOD(data, fileNumber, pixels, mode='majority', tiles=False):
+    render.save_frame(data, fileNumber, pixels, mode)
+    if tiles:
+        render.save_tile_pyramid(data, 'tiles_' + str(fileNumber), mode)
+
+
+# Function to pick the right plot for the grid size
+def plotFrame(data, fileNumber, pixels=800):
+    if max(data.shape) > pixels:
+        plotSpatialLOD(data, fileNumber, pixels)
+    else:
+        plotSpatial(data, fileNumber)
+
+
 # Function to plot the temporal dynamics over time
 def plotDynamics(data):
     fig, axes = plt.subplots(figsize=(7, 6))
@@ -33,10 +50,23 @@ def plotDynamics(data):
     plt.close()
 
 
+# Function to save the counts and the spatial statistics together
+def saveDynamics(data):
+    series = {'time': data[0], 'grass': data[1], 'velociraptor': data[2], 't-rex': data[3],
+              'triceratops': data[4], 'brachiosaurus': data[5], 'human': data[6]}
+    # spatial statistics have their own time axis since they can be strided
+    for name, values in data[7].items():
+        series['spatial_' + name] = values
+    np.savez('temporalDynamics.npz', **{name: np.array(values) for name, values in series.items()})
+
+
 # Main function to run the simulation
 def main():
-    random.seed(time.time())
+    seed = int(time.time())
+    random.seed(seed)
     sizeX, sizeY = 50, 50  # increased domain size to 50x50
+    # per-cell random numbers so runs can be reproduced from the seed whatever the engine
+    rng = el.CellRNG(seed, (sizeY, sizeX))
 
     # different initial spawn rates
     domain = np.zeros((sizeY, sizeX), dtype=int)
@@ -56,12 +86,21 @@ def main():
             else:  # 11% human
                 domain[i, j] = 5
 
+    # health, age and tame timers of every animal, they move with the animals
+    layers = el.AnimalLayers(domain)
+    # kill and reproduction chances for every hunt, worked out once from the species table
+    tables = el.interaction_tables()
+
     # Initialize lists to store simulation data over time
     simTime, grass, velociraptors, trexes, triceratops, brachiosaurus, humans = [], [], [], [], [], [], []
+    spatialStats = {}
+    # spatial statistics every 10 steps, 0 turns them off
+    # they cost about 14% of an engine step at 1000x1000, so only strided runs stay near a 10% budget
+    spatialStride = 10
     currTime = 0
 
     # Plot the initial state of the grid
-    plotSpatial(domain, currTime)
+    plotFrame(domain, currTime)
 
     # Collect initial counts
     simTime.append(currTime)
@@ -71,15 +110,18 @@ def main():
     triceratops.append(np.count_nonzero(domain == 3))
     brachiosaurus.append(np.count_nonzero(domain == 4))
     humans.append(np.count_nonzero(domain == 5))
+    if spatialStride:
+        ss.record(spatialStats, currTime, domain)
 
     # Run the simulation for 100 time steps
     for currTime in range(1, 101):
         print(currTime)
-        domain = el.update_states(domain)  # Update the states (growth, movement, etc.) in the grid
-        domain = el.update_positions(domain)  # Update the positions of animals in the grid
+        rng.set_step(currTime)
+        domain = el.update_states(domain, rng, layers, tables)  # Update the states (growth, movement, etc.) in the grid
+        domain = el.update_positions(domain, rng, layers)  # Update the positions of animals in the grid
 
         # Plot the spatial distribution at each time step
-        plotSpatial(domain, currTime)
+        plotFrame(domain, currTime)
 
         # Collect population data at each time step
         simTime.append(currTime)
@@ -89,10 +131,13 @@ def main():
         triceratops.append(np.count_nonzero(domain == 3))
         brachiosaurus.append(np.count_nonzero(domain == 4))
         humans.append(np.count_nonzero(domain == 5))
+        if spatialStride and currTime % spatialStride == 0:
+            ss.record(spatialStats, currTime, domain)
 
     # Prepare data for plotting temporal dynamics
-    temporal_dynamics = [simTime, grass, velociraptors, trexes, triceratops, brachiosaurus, humans]
+    temporal_dynamics = [simTime, grass, velociraptors, trexes, triceratops, brachiosaurus, humans, spatialStats]
     plotDynamics(temporal_dynamics)
+    saveDynamics(temporal_dynamics)
 
 
 # Run the main function to execute the simulation
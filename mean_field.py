@@ -0,0 +1,134 @@
+import numpy as np
+import functional as el
+
+# mean-field version of the automaton: instead of a grid we only track the fraction of cells
+# held by each species (index 0 is grass, like the domain) and assume everything is well mixed
+# every function works on a whole batch of parameter sets at once, arrays have a leading axis P
+
+NEIGHBORS = 8
+
+
+def params_from_species(species_stats=el.species_stats, prey_rules=el.prey_rules,
+                        kill_repro_multipliers=el.kill_repro_multipliers):
+    # one parameter set (P = 1) from a species table, same numbers the automaton uses
+    kill_table, repro_table = el.build_interaction_tables(species_stats, prey_rules, kill_repro_multipliers)
+    params = {
+        'survivability': np.ones(6),
+        'reproduction_rate': np.zeros(6),
+        'harvest_rate': np.zeros(6),
+        'prey': np.zeros((6, 6)),
+        'kill_table': kill_table,
+        'repro_table': repro_table,
+        'tame_chance': np.array(el.TAME_CHANCE)
+    }
+    for number, species in species_stats.items():
+        params['survivability'][number] = species.survivability
+        params['reproduction_rate'][number] = species.reproduction_rate
+        params['harvest_rate'][number] = species.harvest_rate
+    for attacker, targets in prey_rules.items():
+        params['prey'][attacker, targets] = 1
+    return {name: value[None] for name, value in params.items()}
+
+
+def stack_params(param_sets):
+    # many parameter sets into one batch
+    return {name: np.concatenate([params[name] for params in param_sets]) for name in param_sets[0]}
+
+
+def densities(domain):
+    # fraction of cells held by each species
+    return np.bincount(domain.ravel(), minlength=6)[:6] / domain.size
+
+
+def rates(params, x):
+    # expected gains and losses of each density over one round, both shape (P, 6)
+    # follows the same order as update_states: random death, harvest, then hunting
+    n = len(x)
+    gains = np.zeros_like(x)
+    losses = x * (1 - params['survivability'])
+    x = x * params['survivability']
+    grass = np.clip(1 - x[:, 1:].sum(1, keepdims=True), 0, 1)
+
+    # harvesters try grass neighbours until one is harvested, then try to reproduce once
+    harvested = 1 - (1 - params['harvest_rate']) ** (NEIGHBORS * grass)
+    gains += x * harvested * params['reproduction_rate']
+
+    # raptors and t-rexes next to a human in the last TAME_ROUNDS rounds are tamed
+    tamed_per_round = 1 - (1 - params['tame_chance'][:, None]) ** (NEIGHBORS * x[:, 5:6])
+    tamed = 1 - (1 - tamed_per_round) ** el.TAME_ROUNDS
+
+    # prey_density[p, attacker, target], humans cant attack tamed dinos
+    prey_density = params['prey'] * x[:, None, :]
+    prey_density[:, 5, 1:3] *= 1 - tamed
+    total_prey = prey_density.sum(2, keepdims=True)
+    has_prey = 1 - (1 - total_prey) ** NEIGHBORS
+    attacks = x[:, :, None] * has_prey * np.divide(prey_density, total_prey,
+                                                  out=np.zeros_like(prey_density), where=total_prey > 0)
+
+    # kill chance at the expected number of same species neighbours, interpolated in the table
+    pack = NEIGHBORS * x
+    low = np.minimum(pack.astype(int), NEIGHBORS - 1)
+    frac = (pack - low)[:, :, None]
+    kill_table = np.broadcast_to(params['kill_table'], (n, 6, 6, NEIGHBORS + 1))
+    low = np.broadcast_to(low[:, :, None, None], (n, 6, 6, 1))
+    kill_low = np.take_along_axis(kill_table, low, 3)[..., 0]
+    kill_high = np.take_along_axis(kill_table, low + 1, 3)[..., 0]
+    kills = attacks * np.clip(kill_low + frac * (kill_high - kill_low), 0, 1)
+
+    losses += kills.sum(1)
+    gains += (kills * params['repro_table']).sum(2)
+    gains[:, 0] = losses[:, 0] = 0
+    return gains, losses
+
+
+def step(params, x, corrections=None):
+    # one round, corrections scale the gain and loss terms per species
+    gains, losses = rates(params, x)
+    if corrections is not None:
+        gains = gains * corrections['gain']
+        losses = losses * corrections['loss']
+    x = np.clip(x + gains - losses, 0, 1)
+    # animals cant fill more than the whole grid
+    animals = x[:, 1:].sum(1, keepdims=True)
+    x[:, 1:] /= np.maximum(animals, 1)
+    x[:, 0] = 1 - x[:, 1:].sum(1)
+    return x
+
+
+def simulate(params, x0, steps, corrections=None):
+    # densities over time for every parameter set, shape (steps + 1, P, 6)
+    n = len(params['survivability'])
+    x = np.broadcast_to(np.asarray(x0, dtype=float), (n, 6)).copy()
+    history = [x]
+    for _ in range(steps):
+        x = step(params, x, corrections)
+        history.append(x)
+    return np.array(history)
+
+
+def automaton_ensemble(domain, runs, steps, seed=0):
+    # densities over time from full automaton runs of one starting domain, shape (runs, steps + 1, 6)
+    ensemble = []
+    for run in range(runs):
+        counts, _ = el.simulate(domain, steps, seed + run)
+        ensemble.append(counts / domain.size)
+    return np.array(ensemble)
+
+
+def calibrate(params, ensemble, shrink=0.1):
+    # fit per species gain/loss corrections so the mean field matches the automaton
+    # least squares of the observed change each round against the model's gain and loss terms
+    # at the states the automaton actually went through, pulled towards 1 (no correction) by shrink
+    before = ensemble[:, :-1].reshape(-1, 6)
+    change = (ensemble[:, 1:] - ensemble[:, :-1]).reshape(-1, 6)
+    gains, losses = rates(params, before)
+    corrections = {'gain': np.ones(6), 'loss': np.ones(6)}
+    for species in range(1, 6):
+        terms = np.stack([gains[:, species], -losses[:, species]], 1)
+        if not terms.any():
+            continue
+        normal = terms.T @ terms
+        penalty = shrink * np.trace(normal) / 2 * np.eye(2)
+        fit = np.linalg.solve(normal + penalty, terms.T @ change[:, species] + penalty @ np.ones(2))
+        corrections['gain'][species], corrections['loss'][species] = np.maximum(fit, 0)
+    return corrections
@@ -0,0 +1,88 @@
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib import colors
+
+# level of detail rendering for grids with more cells than the picture has pixels
+# the domain is summarised per block of cells (one block = one pixel) before colouring,
+# so a frame only touches about pixels * max_samples^2 cells instead of the whole grid
+
+# grass, velociraptor, t-rex, triceratops, brachiosaurus, human
+SPECIES_COLORS = ['lawngreen', 'orange', 'red', 'purple', 'darkgreen', 'yellow']
+PALETTE = np.array([colors.to_rgb(color) for color in SPECIES_COLORS])
+TILE_SIZE = 256
+
+
+def block_counts(domain, block, max_samples=4):
+    # cells of each species in every block x block square, shape (6, rows / block, cols / block)
+    # big blocks are only sampled on a max_samples x max_samples lattice spread over the whole block
+    rows, cols = domain.shape
+    out_rows, out_cols = -(-rows // block), -(-cols // block)
+    samples = min(block, max_samples)
+    offsets = np.linspace(0, block - 1, samples).astype(int)
+    sample_rows = ((block * np.arange(out_rows))[:, None] + offsets).ravel()
+    sample_cols = ((block * np.arange(out_cols))[:, None] + offsets).ravel()
+    # lattice points past the edge of the grid are set to -1 so edge blocks only count real cells
+    sampled = domain[np.minimum(sample_rows, rows - 1)[:, None], np.minimum(sample_cols, cols - 1)]
+    sampled[sample_rows >= rows, :] = -1
+    sampled[:, sample_cols >= cols] = -1
+    blocks = sampled.reshape(out_rows, samples, out_cols, samples)
+    dtype = np.min_scalar_type(samples * samples)
+    return np.array([(blocks == species).sum((1, 3), dtype=dtype) for species in range(6)])
+
+
+def colorize(counts, mode='majority'):
+    # RGB image from block counts
+    # majority = colour of the most common species, blend = colours mixed by species fraction
+    if mode == 'majority':
+        return PALETTE[counts.argmax(0)]
+    if mode == 'blend':
+        fractions = counts / np.maximum(counts.sum(0), 1)
+        return np.tensordot(fractions, PALETTE, axes=(0, 0))
+    raise ValueError("mode must be 'majority' or 'blend', not %r" % mode)
+
+
+def downsample(domain, pixels, mode='majority', max_samples=4):
+    # image of the domain at most pixels wide/tall
+    block = -(-max(domain.shape) // pixels)
+    return colorize(block_counts(domain, block, max_samples), mode)
+
+
+def save_frame(domain, fileNumber, pixels=1000, mode='majority'):
+    plt.imsave('figure_' + str(fileNumber) + '.png', downsample(domain, pixels, mode), origin='lower')
+
+
+def save_tile_pyramid(domain, folder, mode='majority'):
+    # zoomable pyramid: level 0 fits the whole grid in one tile, every level after that
+    # doubles the resolution until one pixel is one cell, tiles are folder/level/row_col.png
+    # tiles are saved with origin='lower' like the other plots, so tile row 0 is the BOTTOM of the
+    # grid (zoom viewers usually expect row 0 at the top, flip the row number for those)
+    # the finest level is coloured straight from the domain, each coarser level adds up 2x2 blocks
+    # of the one below in the smallest integer type that fits, and is written and dropped as we go
+    finest = 0
+    while -(-max(domain.shape) // 2 ** finest) > TILE_SIZE:
+        finest += 1
+
+    save_tiles(domain, os.path.join(folder, str(finest)), lambda tile: PALETTE[tile])
+    counts = None
+    for level in range(finest - 1, -1, -1):
+        if counts is None:
+            counts = block_counts(domain, 2, max_samples=2)
+        else:
+            rows, cols = counts.shape[1:]
+            dtype = np.min_scalar_type(4 ** (finest - level))
+            padded = np.zeros((6, rows + rows % 2, cols + cols % 2), dtype=dtype)
+            padded[:, :rows, :cols] = counts
+            counts = padded.reshape(6, padded.shape[1] // 2, 2, padded.shape[2] // 2, 2).sum((2, 4), dtype=dtype)
+        save_tiles(counts, os.path.join(folder, str(level)), lambda tile: colorize(tile, mode))
+
+
+def save_tiles(grid, folder, color):
+    # cut a level into TILE_SIZE squares (last two axes) and colour each one on its own
+    os.makedirs(folder, exist_ok=True)
+    rows, cols = grid.shape[-2:]
+    for tile_row in range(0, rows, TILE_SIZE):
+        for tile_col in range(0, cols, TILE_SIZE):
+            tile = grid[..., tile_row:tile_row + TILE_SIZE, tile_col:tile_col + TILE_SIZE]
+            name = '%d_%d.png' % (tile_row // TILE_SIZE, tile_col // TILE_SIZE)
+            plt.imsave(os.path.join(folder, name), color(tile), origin='lower')
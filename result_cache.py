@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+import numpy as np
+import functional as el
+
+# on-disk cache of simulation results, keyed by a hash of everything that decides the outcome:
+# species table, prey rules, starting domain, steps, seed and the engine source itself
+# files are written to a temp name and renamed into place so several worker processes can
+# share one cache directory, least recently used entries are deleted once it gets too big
+
+CACHE_DIR = '.sim_cache'
+MAX_BYTES = 500 * 1024 ** 2  # 500 MB
+STALE_TMP_SECONDS = 3600  # temp files this old were left by a worker that died mid-write
+
+
+def engine_version():
+    # hash of the engine code, so editing functional.py makes old results stale
+    with open(el.__file__, 'rb') as engine:
+        return hashlib.sha256(engine.read()).hexdigest()
+
+
+def scenario_key(domain, steps, seed, use_layers=False):
+    # the interaction tables are hashed as the engine will build them, on top of the species stats
+    # they come from, since survivability/speed/harvest_rate are read straight off the species
+    kill_table, repro_table = el.interaction_tables()
+    scenario = {
+        'species': {number: [type(species).__name__, vars(species)] for number, species in el.species_stats.items()},
+        'tables': hashlib.sha256(kill_table.tobytes() + repro_table.tobytes()).hexdigest(),
+        'prey_rules': el.prey_rules,
+        'kill_repro_multipliers': el.kill_repro_multipliers,
+        'tame': [el.TAME_ROUNDS, el.TAME_CHANCE],
+        'wound_factor': el.WOUND_FACTOR,
+        'shape': domain.shape,
+        'domain': hashlib.sha256(np.ascontiguousarray(domain, dtype=np.int64).tobytes()).hexdigest(),
+        'steps': int(steps),
+        'seed': int(seed),
+        'use_layers': bool(use_layers),
+        'engine': engine_version()
+    }
+    # numpy numbers from sweeps (np.arange, np.float32 stats) are hashed as plain python numbers
+    encoded = json.dumps(scenario, sort_keys=True, default=lambda value: value.item())
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def load(path):
+    # cached result or None, touching the file marks it as recently used
+    try:
+        with np.load(path) as cached:
+            result = {name: cached[name] for name in cached.files}
+    except (OSError, ValueError):  # missing, or removed/replaced by another worker meanwhile
+        return None
+    except zipfile.BadZipFile:  # truncated or corrupt entry, drop it and count it as a miss
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return None
+    try:
+        os.utime(path)
+    except OSError:  # evicted by another worker after we read it, the data is still good
+        pass
+    return result
+
+
+def store(path, result, cache_dir):
+    # write to a temp file then rename, so readers never see a half written file
+    handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            np.savez(temp_file, **result)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def evict(cache_dir, max_bytes):
+    # delete least recently used results until the cache fits in max_bytes
+    # temp files count towards the size, old ones are left over from dead workers and deleted
+    entries = []
+    total = 0
+    now = time.time()
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            info = os.stat(path)
+            if name.endswith('.tmp') and now - info.st_mtime > STALE_TMP_SECONDS:
+                os.remove(path)
+                continue
+        except FileNotFoundError:  # another worker evicted or renamed it
+            continue
+        if name.endswith('.npz'):
+            entries.append((info.st_mtime, info.st_size, name))
+            total += info.st_size
+        elif name.endswith('.tmp'):
+            total += info.st_size
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def cached_simulate(domain, steps, seed, use_layers=False, keep_domain=False,
+                    cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+    # el.simulate through the cache, returns (counts, final domain or None)
+    # the final domain is only stored when keep_domain is set
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, scenario_key(domain, steps, seed, use_layers) + '.npz')
+    cached = load(path)
+    if cached is not None and (not keep_domain or 'domain' in cached):
+        return cached['counts'], cached.get('domain')
+
+    counts, final_domain = el.simulate(domain, steps, seed, use_layers)
+    result = {'counts': counts}
+    if keep_domain:
+        result['domain'] = final_domain
+    store(path, result, cache_dir)
+    evict(cache_dir, max_bytes)
+    return counts, result.get('domain')
@@ -0,0 +1,155 @@
+import numpy as np
+
+# species pairs looked at by default: each species with itself, herbivores/humans with grass
+# and the carnivores with everything they hunt
+DEFAULT_PAIRS = [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5),
+                 (3, 0), (4, 0), (5, 0),
+                 (1, 3), (1, 4), (1, 5), (2, 3), (2, 4), (2, 5)]
+
+# cluster sizes are binned as 1, 2-3, 4-7, 8-15, ... so every step has the same length histogram
+CLUSTER_BINS = 24
+
+
+def pair_correlations(domain, pairs=DEFAULT_PAIRS, max_r=10):
+    # pair-correlation function g(r) for r = 1..max_r for every (a, b) pair
+    # g = 1 means no structure, > 1 means b is found near a more often than by chance
+    # correlations are done with FFTs, padded with zeros so offsets up to max_r dont wrap around
+    rows, cols = domain.shape
+    shape = (rows + max_r, cols + max_r)
+    area = rows * cols
+    species = sorted({s for pair in pairs for s in pair})
+    spectra = {s: np.fft.rfft2(domain == s, shape) for s in species}
+    counts = {s: np.count_nonzero(domain == s) for s in species}
+
+    # every offset within max_r and the distance bin it falls in
+    offsets = np.arange(-max_r, max_r + 1)
+    offset_r, offset_c = np.meshgrid(offsets, offsets, indexing='ij')
+    radius = np.rint(np.hypot(offset_r, offset_c)).astype(int)
+    keep = (radius >= 1) & (radius <= max_r)
+    window = np.ix_(offsets % shape[0], offsets % shape[1])
+
+    def radial(spectrum):
+        # sum a correlation over all offsets at each distance
+        corr = np.fft.irfft2(spectrum, shape)[window]
+        return np.bincount(radius[keep], weights=corr[keep], minlength=max_r + 1)[1:]
+
+    # number of cell pairs at each distance that fit inside the grid
+    ones = np.fft.rfft2(np.ones((rows, cols)), shape)
+    cell_pairs = radial(ones * ones.conj())
+
+    result = {}
+    for a, b in pairs:
+        if a == b:
+            # an animal is never paired with itself
+            if counts[a] < 2:
+                result[(a, b)] = np.full(max_r, np.nan)
+                continue
+            expected = counts[a] * (counts[a] - 1) / (area * (area - 1)) * cell_pairs
+        else:
+            if counts[a] == 0 or counts[b] == 0:
+                result[(a, b)] = np.full(max_r, np.nan)
+                continue
+            expected = counts[a] * counts[b] / area ** 2 * cell_pairs
+        observed = radial(spectra[a] * spectra[b].conj())
+        result[(a, b)] = observed / expected
+    return result
+
+
+def label_clusters(mask):
+    # labels touching cells (8 neighbours, like get_neighbors) of a mask
+    # vectorized union-find: hook roots onto the smaller root across every edge, then
+    # pointer-jump until each cell points at its root, repeat until no edge joins two roots
+    rows, cols = mask.shape
+    index = np.arange(rows * cols).reshape(rows, cols)
+    edges_a, edges_b = [], []
+    for dr, dc in [(0, 1), (1, -1), (1, 0), (1, 1)]:
+        c0, c1 = max(0, -dc), cols - max(0, dc)
+        a = index[0:rows - dr, c0:c1]
+        b = index[dr:rows, c0 + dc:c1 + dc]
+        both = mask[0:rows - dr, c0:c1] & mask[dr:rows, c0 + dc:c1 + dc]
+        edges_a.append(a[both])
+        edges_b.append(b[both])
+    edges_a = np.concatenate(edges_a)
+    edges_b = np.concatenate(edges_b)
+
+    parent = index.ravel().copy()
+    while True:
+        root_a = parent[edges_a]
+        root_b = parent[edges_b]
+        joined = root_a != root_b
+        if not joined.any():
+            break
+        low = np.minimum(root_a[joined], root_b[joined])
+        high = np.maximum(root_a[joined], root_b[joined])
+        np.minimum.at(parent, high, low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    labels = parent.reshape(rows, cols)
+    labels[~mask] = -1
+    return labels
+
+
+def cluster_sizes(domain, species):
+    # size of every cluster of touching cells of one species
+    mask = domain == species
+    if not mask.any():
+        return np.zeros(0, dtype=int)
+    labels = label_clusters(mask)
+    return np.unique(labels[mask], return_counts=True)[1]
+
+
+def cluster_histogram(sizes):
+    # number of clusters with size in 1, 2-3, 4-7, ... (log2 bins)
+    bins = np.minimum(np.log2(sizes).astype(int), CLUSTER_BINS - 1)
+    return np.bincount(bins, minlength=CLUSTER_BINS)
+
+
+def mean_nearest_neighbor_distance(domain, species, max_r=10):
+    # average distance from each animal to the nearest other one of its species
+    # distance is in moves (chessboard distance, like the 8 neighbour movement), capped at max_r
+    # uses a summed-area table so each radius is one gather over the animals still searching
+    mask = domain == species
+    members_r, members_c = np.nonzero(mask)
+    if len(members_r) < 2:
+        return np.nan
+    rows, cols = domain.shape
+    table = np.zeros((rows + 1, cols + 1), dtype=np.int64)
+    table[1:, 1:] = mask.cumsum(0).cumsum(1)
+
+    distance = np.full(len(members_r), max_r)
+    searching = np.arange(len(members_r))
+    for r in range(1, max_r + 1):
+        sr, sc = members_r[searching], members_c[searching]
+        r0, r1 = np.maximum(sr - r, 0), np.minimum(sr + r + 1, rows)
+        c0, c1 = np.maximum(sc - r, 0), np.minimum(sc + r + 1, cols)
+        in_box = table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0]
+        found = in_box > 1  # more than just itself
+        distance[searching[found]] = r
+        searching = searching[~found]
+        if len(searching) == 0:
+            break
+    return distance.mean()
+
+
+def spatial_summary(domain, pairs=DEFAULT_PAIRS, max_r=10):
+    # all the spatial statistics for one step as a flat dict of name -> value
+    summary = {}
+    for (a, b), g in pair_correlations(domain, pairs, max_r).items():
+        summary['g_%d_%d' % (a, b)] = g
+    for species in range(1, 6):
+        sizes = cluster_sizes(domain, species)
+        summary['clusters_%d' % species] = cluster_histogram(sizes)
+        summary['largest_cluster_%d' % species] = sizes.max() if len(sizes) else 0
+        summary['nn_distance_%d' % species] = mean_nearest_neighbor_distance(domain, species, max_r)
+    return summary
+
+
+def record(store, step, domain, pairs=DEFAULT_PAIRS, max_r=10):
+    # append this step's spatial statistics to a time-series store (dict of lists)
+    store.setdefault('time', []).append(step)
+    for name, value in spatial_summary(domain, pairs, max_r).items():
+        store.setdefault(name, []).append(value)